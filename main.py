@@ -1,6 +1,10 @@
 """
 OpenPull API Service
 FastAPI wrapper for OpenPull scraper
+
+Set OPENPULL_WORKERS to run scrapes in that many worker processes, each with its
+own browsers (see openpull.workers.WorkerConfig for the other OPENPULL_* settings).
+Unset or 0, scrapes run in this process.
 """
 
 from fastapi import FastAPI, HTTPException
@@ -16,7 +20,9 @@ from pathlib import Path
 # Add the parent directory to the path so we can import openpull
 sys.path.insert(0, str(Path(__file__).parent))
 
+from openpull.cache import ScrapeCache
 from openpull.scraper import FlexibleScraper
+from openpull.workers import WorkerConfig, WorkerPool
 
 app = FastAPI(title="OpenPull API", version="1.0.0")
 
@@ -34,7 +40,17 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     print("⚠️  WARNING: GEMINI_API_KEY not set. Scraper will not work without it.")
 
+worker_config = WorkerConfig.from_env()
+WORKER_MODE = worker_config.num_workers > 0
+
 scraper = None
+worker_pool: Optional[WorkerPool] = None
+
+
+def build_scraper(cache: Optional[ScrapeCache] = None) -> FlexibleScraper:
+    """Create a scraper; also used by worker processes"""
+    return FlexibleScraper(api_key=GEMINI_API_KEY, cache=cache)
+
 
 async def get_scraper():
     """Lazy initialization of scraper"""
@@ -42,10 +58,26 @@ async def get_scraper():
     if scraper is None:
         if not GEMINI_API_KEY:
             raise HTTPException(status_code=500, detail="GEMINI_API_KEY not configured")
-        scraper = FlexibleScraper(api_key=GEMINI_API_KEY)
+        scraper = build_scraper(worker_config.create_cache())
     return scraper
 
 
+@app.on_event("startup")
+async def start_workers():
+    """Start the worker pool when running in worker mode"""
+    global worker_pool
+    if WORKER_MODE and GEMINI_API_KEY:
+        worker_pool = WorkerPool(build_scraper, worker_config)
+        await worker_pool.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    """Stop the worker pool"""
+    if worker_pool is not None:
+        await worker_pool.stop()
+
+
 class ScrapeRequest(BaseModel):
     url: str = Field(..., description="URL to scrape")
     prompt: Optional[str] = Field(None, description="Optional prompt for LLM extraction")
@@ -63,11 +95,16 @@ class ScrapeResponse(BaseModel):
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {
+    health_info = {
         "status": "healthy",
         "service": "openpull-api",
         "gemini_configured": GEMINI_API_KEY is not None,
     }
+    if worker_pool is not None:
+        health_info["workers"] = worker_pool.health()
+        if not worker_pool.healthy:
+            health_info["status"] = "degraded"
+    return health_info
 
 
 @app.post("/v1/scrape", response_model=ScrapeResponse)
@@ -78,14 +115,20 @@ async def scrape(request: ScrapeRequest):
     Returns scraped content, optionally structured via LLM extraction
     """
     try:
-        scraper_instance = await get_scraper()
-        
         # Scrape with optional prompt and schema
-        result = await scraper_instance.scrape(
-            url=request.url,
-            prompt=request.prompt,
-            schema=request.schema,
-        )
+        if worker_pool is not None:
+            result = await worker_pool.submit(
+                url=request.url,
+                prompt=request.prompt,
+                schema=request.schema,
+            )
+        else:
+            scraper_instance = await get_scraper()
+            result = await scraper_instance.scrape(
+                url=request.url,
+                prompt=request.prompt,
+                schema=request.schema,
+            )
         
         # Extract content from result
         # OpenPull returns different formats, handle both
@@ -1,6 +1,16 @@
 """openpull: Pull structured data from any website using LLM extraction."""
 
+from .cache import ScrapeCache
+from .render_profile import RenderProfile
 from .scraper import FlexibleScraper, FlexibleScraperError
+from .workers import WorkerConfig, WorkerPool
 
 __version__ = "0.1.0"
-__all__ = ["FlexibleScraper", "FlexibleScraperError"]
+__all__ = [
+    "FlexibleScraper",
+    "FlexibleScraperError",
+    "RenderProfile",
+    "ScrapeCache",
+    "WorkerConfig",
+    "WorkerPool",
+]
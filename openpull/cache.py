@@ -0,0 +1,135 @@
+"""Local cache shared between scraper processes.
+
+Backed by a single SQLite file in WAL mode, so several worker processes on the
+same machine can read and write the page cache and LLM cache concurrently.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+class ScrapeCache:
+    """Namespaced key/value cache with per-entry expiry.
+
+    Values must be JSON-serializable. Each process opens its own connection lazily,
+    so an instance can be created in a parent process and used after a fork/spawn.
+    Async code should use aget()/aset(), which run the SQLite calls in a thread.
+    Expired entries are purged every PURGE_EVERY writes.
+    """
+
+    PAGES = "pages"
+    LLM = "llm"
+
+    PURGE_EVERY = 200
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, path: str, ttl: int = 3600):
+        """Initialize ScrapeCache.
+
+        Args:
+            path: SQLite database file, created if missing
+            ttl: Seconds an entry stays valid (0 disables expiry)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, creating the schema on first use."""
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at and expires_at < time.time():
+            self.delete(namespace, key)
+            return None
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value, replacing any existing entry."""
+        expires_at = time.time() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+            self._writes += 1
+            purge = self._writes % self.PURGE_EVERY == 0
+        if purge:
+            self.purge_expired()
+
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        """Async get() that does not block the event loop on SQLite locks."""
+        return await asyncio.to_thread(self.get, namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any) -> None:
+        """Async set() that does not block the event loop on SQLite locks."""
+        await asyncio.to_thread(self.set, namespace, key, value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM cache WHERE expires_at > 0 AND expires_at < ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_pid"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,256 @@
+"""Rendering profiles for lightweight crawling.
+
+A RenderProfile tells the crawler which requests it may skip while rendering a page.
+Only the page markdown/HTML is used for extraction, so images, fonts, media and
+third-party trackers can usually be blocked without affecting the result.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+
+class RenderProfile:
+    """Resource blocking and viewport settings applied to every crawled page.
+
+    Requests are blocked by Playwright resource type (image, font, media, ...) and by
+    a domain blocklist matched against the request host and its parent domains. Only
+    the top-level navigation is always allowed; iframes are subject to the blocklist.
+    """
+
+    # Resource types that never contribute to the extracted text. Images and
+    # stylesheets are controlled by the disable_images / disable_css flags.
+    DEFAULT_BLOCKED_RESOURCE_TYPES = ("media", "font")
+    FLAG_RESOURCE_TYPES = ("image", "stylesheet")
+
+    # Common ad, analytics and tracking hosts
+    DEFAULT_BLOCKED_DOMAINS = (
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googleadservices.com",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googletagservices.com",
+        "adservice.google.com",
+        "facebook.net",
+        "connect.facebook.net",
+        "hotjar.com",
+        "segment.com",
+        "segment.io",
+        "mixpanel.com",
+        "amplitude.com",
+        "fullstory.com",
+        "clarity.ms",
+        "intercom.io",
+        "hs-analytics.net",
+        "hs-scripts.com",
+        "adnxs.com",
+        "criteo.com",
+        "taboola.com",
+        "outbrain.com",
+        "scorecardresearch.com",
+        "quantserve.com",
+    )
+
+    # Rough average transfer size per resource type, used to estimate bytes saved
+    # for requests that were aborted before any response was received.
+    ESTIMATED_BYTES_BY_TYPE = {
+        "document": 30_000,
+        "image": 45_000,
+        "media": 500_000,
+        "font": 30_000,
+        "stylesheet": 25_000,
+        "script": 40_000,
+        "xhr": 5_000,
+        "fetch": 5_000,
+        "other": 10_000,
+    }
+
+    def __init__(
+        self,
+        blocked_resource_types: Optional[Iterable[str]] = None,
+        blocked_domains: Optional[Iterable[str]] = None,
+        disable_images: bool = True,
+        disable_css: bool = False,
+        block_third_party_scripts: bool = False,
+        viewport_width: int = 960,
+        viewport_height: int = 540,
+    ):
+        """Initialize RenderProfile.
+
+        Args:
+            blocked_resource_types: Playwright resource types to block, other than
+                image and stylesheet (defaults to DEFAULT_BLOCKED_RESOURCE_TYPES)
+            blocked_domains: Hosts to block, including subdomains
+                (defaults to DEFAULT_BLOCKED_DOMAINS)
+            disable_images: Block images
+            disable_css: Block stylesheets
+            block_third_party_scripts: Block scripts served from a different site than the page.
+                Sites are compared by registrable domain using a short list of common
+                two-label suffixes (co.uk, com.au, ...); hosts under other multi-label
+                public suffixes may be treated as first-party.
+            viewport_width: Browser viewport width in pixels (crawl4ai's own default is 1080)
+            viewport_height: Browser viewport height in pixels (crawl4ai's own default is 600)
+
+        Raises:
+            ValueError: If blocked_resource_types contains image or stylesheet
+        """
+        if blocked_resource_types is None:
+            blocked_resource_types = self.DEFAULT_BLOCKED_RESOURCE_TYPES
+        if blocked_domains is None:
+            blocked_domains = self.DEFAULT_BLOCKED_DOMAINS
+
+        self.blocked_resource_types = {t.lower() for t in blocked_resource_types}
+        flag_types = self.blocked_resource_types.intersection(self.FLAG_RESOURCE_TYPES)
+        if flag_types:
+            raise ValueError(
+                f"Use disable_images / disable_css instead of blocking {sorted(flag_types)} "
+                "via blocked_resource_types"
+            )
+        if disable_images:
+            self.blocked_resource_types.add("image")
+        if disable_css:
+            self.blocked_resource_types.add("stylesheet")
+
+        self.blocked_domains = {d.lower().lstrip(".") for d in blocked_domains}
+        self.block_third_party_scripts = block_third_party_scripts
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+
+    @classmethod
+    def lightweight(cls) -> "RenderProfile":
+        """Aggressive profile for text extraction: no images, CSS, media, fonts or trackers."""
+        return cls(
+            disable_images=True,
+            disable_css=True,
+            block_third_party_scripts=True,
+            viewport_width=800,
+            viewport_height=450,
+        )
+
+    def block_reason(
+        self,
+        url: str,
+        resource_type: str,
+        page_domain: str = "",
+        is_main_document: bool = False,
+    ) -> Optional[str]:
+        """Return why a request should be blocked, or None to let it through.
+
+        Args:
+            url: Request URL
+            resource_type: Playwright resource type of the request
+            page_domain: Host of the page being crawled, used for third-party checks
+            is_main_document: True for the top-level navigation, which is never blocked
+
+        Returns:
+            "resource_type", "domain" or "third_party_script", or None
+        """
+        if is_main_document:
+            return None
+
+        host = (urlparse(url).hostname or "").lower()
+
+        if resource_type in self.blocked_resource_types:
+            return "resource_type"
+        if host and self._host_is_blocked(host):
+            return "domain"
+        if (
+            self.block_third_party_scripts
+            and resource_type == "script"
+            and host
+            and page_domain
+            and not _same_site(host, page_domain.lower())
+        ):
+            return "third_party_script"
+        return None
+
+    def _host_is_blocked(self, host: str) -> bool:
+        """Check host and each of its parent domains against the blocklist."""
+        parts = host.split(".")
+        return any(".".join(parts[i:]) in self.blocked_domains for i in range(len(parts)))
+
+    def cache_key(self) -> str:
+        """Stable description of the settings that affect rendered content."""
+        return json.dumps(
+            {
+                "blocked_resource_types": sorted(self.blocked_resource_types),
+                "blocked_domains": sorted(self.blocked_domains),
+                "block_third_party_scripts": self.block_third_party_scripts,
+                "viewport": [self.viewport_width, self.viewport_height],
+            },
+            sort_keys=True,
+        )
+
+    def create_stats(self) -> "RenderStats":
+        """Create an empty stats accumulator for one scrape."""
+        return RenderStats(self.ESTIMATED_BYTES_BY_TYPE)
+
+
+class RenderStats:
+    """Counts blocked and loaded requests for a single scrape."""
+
+    def __init__(self, estimated_bytes_by_type: Dict[str, int]):
+        self._estimated_bytes_by_type = estimated_bytes_by_type
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+        self.bytes_loaded = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.blocked_by_reason: Dict[str, int] = {}
+        self.pages_from_cache = 0
+
+    def record_blocked(self, resource_type: str, reason: str) -> None:
+        """Record a request that was aborted."""
+        self.requests_blocked += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+        self.estimated_bytes_saved += self._estimated_bytes_by_type.get(
+            resource_type, self._estimated_bytes_by_type["other"]
+        )
+
+    def record_cache_hit(self) -> None:
+        """Record a page served from the page cache, which made no requests at all."""
+        self.pages_from_cache += 1
+
+    def record_allowed(self) -> None:
+        """Record a request that was let through."""
+        self.requests_allowed += 1
+
+    def record_response(self, headers: Dict[str, str]) -> None:
+        """Add the Content-Length of a received response to bytes_loaded."""
+        try:
+            self.bytes_loaded += int(headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary suitable for inclusion in a scrape result."""
+        return {
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "bytes_loaded": self.bytes_loaded,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "blocked_by_reason": dict(self.blocked_by_reason),
+            "from_cache": self.pages_from_cache > 0,
+            "pages_from_cache": self.pages_from_cache,
+        }
+
+
+# Second-level labels that, under a two-letter country TLD, form a public suffix
+# (example.co.uk, example.com.au). Not a full public suffix list.
+_COUNTRY_SECOND_LEVEL_LABELS = {"co", "com", "net", "org", "gov", "ac", "edu", "ne", "or"}
+
+
+def _registrable_domain(host: str) -> str:
+    """Approximate the registrable domain (eTLD+1) of a host."""
+    labels = host.split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _COUNTRY_SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _same_site(host: str, page_domain: str) -> bool:
+    """Loose same-site check: hosts share their registrable domain."""
+    return _registrable_domain(host) == _registrable_domain(page_domain)
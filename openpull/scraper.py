@@ -4,9 +4,22 @@ Multi-page web scraping with LLM-based extraction using crawl4ai.
 Supports multiple LLM backends: OpenRouter (default), Gemini, or any OpenAI-compatible API.
 """
 
+import hashlib
 import json
 import os
-from typing import Any, Dict, List, Optional, Union
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .cache import ScrapeCache
+from .render_profile import RenderProfile, RenderStats
+
+# Stats and page domain of the scrape() running in the current task. The page hook
+# reads it, so concurrent scrapes on one persistent crawler keep separate stats.
+_render_scope: ContextVar[Optional[Tuple[RenderStats, str]]] = ContextVar(
+    "openpull_render_scope", default=None
+)
 
 
 class FlexibleScraperError(Exception):
@@ -25,6 +38,13 @@ class FlexibleScraper:
     - OpenRouter (default): Pass openai_client with OpenRouter base_url
     - Gemini: Pass api_key (legacy mode)
     - Any OpenAI-compatible: Pass openai_client
+
+    Pass a RenderProfile to block images, fonts, trackers and other resources that
+    are not needed for extraction; results then include a "_render_stats" summary.
+
+    Pass a ScrapeCache to reuse crawled pages and LLM responses across calls and
+    processes. Use the scraper as an async context manager (or call open()/close())
+    to keep one browser running across scrape() calls instead of launching one per call.
     """
 
     DEFAULT_MODEL = "google/gemini-2.5-flash"  # OpenRouter model ID
@@ -34,6 +54,8 @@ class FlexibleScraper:
         api_key: Optional[str] = None,
         openai_client: Optional[Any] = None,
         model: Optional[str] = None,
+        render_profile: Optional[RenderProfile] = None,
+        cache: Optional[ScrapeCache] = None,
     ):
         """Initialize FlexibleScraper with LLM backend.
 
@@ -41,6 +63,8 @@ class FlexibleScraper:
             api_key: Google Generative AI API key (legacy mode, for direct Gemini)
             openai_client: OpenAI-compatible client (e.g., OpenRouter, OpenAI)
             model: Model to use for extraction (defaults to DEFAULT_MODEL)
+            render_profile: Optional resource blocking / viewport profile for the crawler
+            cache: Optional page and LLM response cache
 
         Raises:
             FlexibleScraperError: If no valid LLM backend is configured
@@ -48,6 +72,9 @@ class FlexibleScraper:
         self.model = model or self.DEFAULT_MODEL
         self.openai_client = openai_client
         self.gemini_client = None
+        self.render_profile = render_profile
+        self.cache = cache
+        self._crawler: Optional[Any] = None
         
         if openai_client:
             # Use OpenAI-compatible client (OpenRouter, OpenAI, etc.)
@@ -75,6 +102,44 @@ class FlexibleScraper:
         except Exception as e:
             raise FlexibleScraperError(f"Failed to initialize Gemini: {str(e)}")
 
+    async def open(self) -> None:
+        """Start a browser that is reused by every scrape() until close() is called."""
+        if self._crawler is not None:
+            return
+        from crawl4ai import AsyncWebCrawler
+
+        crawler = AsyncWebCrawler(verbose=False, headless=True, browser_type="chromium")
+        await crawler.__aenter__()
+        self._install_render_hook(crawler)
+        self._crawler = crawler
+
+    async def close(self) -> None:
+        """Shut down the browser started by open()."""
+        crawler, self._crawler = self._crawler, None
+        if crawler is not None:
+            await crawler.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> "FlexibleScraper":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def _crawler_session(self) -> AsyncIterator[Any]:
+        """Yield the persistent browser if open, otherwise a browser for this call only."""
+        if self._crawler is not None:
+            yield self._crawler
+            return
+        from crawl4ai import AsyncWebCrawler
+
+        async with AsyncWebCrawler(
+            verbose=False, headless=True, browser_type="chromium"
+        ) as crawler:
+            self._install_render_hook(crawler)
+            yield crawler
+
     async def scrape(
         self,
         url: str,
@@ -102,20 +167,21 @@ class FlexibleScraper:
         Raises:
             FlexibleScraperError: If scraping fails
         """
-        from crawl4ai import AsyncWebCrawler
         from urllib.parse import urlparse
 
+        render_stats = self.render_profile.create_stats() if self.render_profile else None
+        scope_token = None
+        if render_stats is not None:
+            scope_token = _render_scope.set((render_stats, urlparse(url).hostname or ""))
+
         try:
-            async with AsyncWebCrawler(
-                verbose=False, headless=True, browser_type="chromium"
-            ) as crawler:
+            async with self._crawler_session() as crawler:
                 # Scrape first page
-                result = await crawler.arun(
-                    url=url,
-                    bypass_cache=True,
-                    timeout=timeout,
-                    wait_for="networkidle",
-                    delay_before_return_html=2.0,
+                result = await self._crawl(
+                    crawler,
+                    url,
+                    timeout,
+                    render_stats,
                     js_code=["window.scrollTo(0, document.body.scrollHeight);"],
                 )
 
@@ -130,7 +196,10 @@ class FlexibleScraper:
                     raise FlexibleScraperError(error_msg)
 
                 if extract_links:
-                    return self._extract_links(result)
+                    links_data = self._extract_links(result)
+                    if render_stats is not None:
+                        links_data["_render_stats"] = render_stats.to_dict()
+                    return links_data
 
                 html_content = result.markdown or result.html or ""
                 if not html_content:
@@ -157,12 +226,8 @@ class FlexibleScraper:
 
                         for page_url in relevant_urls[: max_pages - 1]:
                             try:
-                                page_result = await crawler.arun(
-                                    url=page_url,
-                                    bypass_cache=True,
-                                    timeout=timeout,
-                                    wait_for="networkidle",
-                                    delay_before_return_html=2.0,
+                                page_result = await self._crawl(
+                                    crawler, page_url, timeout, render_stats
                                 )
 
                                 if page_result.success:
@@ -180,6 +245,8 @@ class FlexibleScraper:
 
                 if isinstance(extracted_data, dict):
                     extracted_data["_pages_scraped"] = pages_scraped
+                    if render_stats is not None:
+                        extracted_data["_render_stats"] = render_stats.to_dict()
 
                 return extracted_data
 
@@ -187,6 +254,101 @@ class FlexibleScraper:
             if isinstance(e, FlexibleScraperError):
                 raise
             raise FlexibleScraperError(f"Scraping failed: {str(e)}")
+        finally:
+            if scope_token is not None:
+                _render_scope.reset(scope_token)
+
+    async def _crawl(
+        self,
+        crawler: Any,
+        url: str,
+        timeout: int,
+        render_stats: Optional[RenderStats] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Crawl a single page, serving it from the page cache when possible."""
+        cache_key = None
+        if self.cache is not None:
+            # Pages rendered with a different profile or crawl options are different entries
+            cache_key = hashlib.sha256(
+                json.dumps(
+                    {
+                        "url": url,
+                        "render_profile": (
+                            self.render_profile.cache_key() if self.render_profile else None
+                        ),
+                        "kwargs": kwargs,
+                    },
+                    sort_keys=True,
+                    default=str,
+                ).encode("utf-8")
+            ).hexdigest()
+            cached = await self.cache.aget(ScrapeCache.PAGES, cache_key)
+            if cached is not None:
+                if render_stats is not None:
+                    render_stats.record_cache_hit()
+                return SimpleNamespace(success=True, error_message=None, **cached)
+
+        result = await crawler.arun(
+            url=url,
+            bypass_cache=True,
+            timeout=timeout,
+            wait_for="networkidle",
+            delay_before_return_html=2.0,
+            **kwargs,
+        )
+
+        if cache_key is not None and result.success:
+            await self.cache.aset(
+                ScrapeCache.PAGES,
+                cache_key,
+                {
+                    "url": result.url,
+                    "html": result.html or "",
+                    "markdown": str(result.markdown or ""),
+                },
+            )
+        return result
+
+    def _install_render_hook(self, crawler: Any) -> None:
+        """Register the render profile page hook on a crawler (crawl4ai 0.4.24+)."""
+        if self.render_profile is not None:
+            crawler.crawler_strategy.set_hook("on_page_context_created", self._render_hook)
+
+    async def _render_hook(self, page: Any, **kwargs: Any) -> Any:
+        """crawl4ai page hook: apply the render profile for the scrape() that opened the page.
+
+        Runs in the task that called crawler.arun(), so _render_scope belongs to that
+        scrape; route and response handlers are bound to its stats here because
+        Playwright invokes them from its own task.
+        """
+        scope = _render_scope.get()
+        if scope is None:
+            return page
+        stats, page_domain = scope
+        profile = self.render_profile
+
+        async def route_request(route: Any) -> None:
+            request = route.request
+            reason = profile.block_reason(
+                request.url,
+                request.resource_type,
+                page_domain,
+                is_main_document=_is_main_navigation(request),
+            )
+            if reason:
+                stats.record_blocked(request.resource_type, reason)
+                await route.abort()
+            else:
+                stats.record_allowed()
+                await route.continue_()
+
+        await page.set_viewport_size(
+            {"width": profile.viewport_width, "height": profile.viewport_height}
+        )
+        page.on("response", lambda response: stats.record_response(response.headers))
+        await page.route("**/*", route_request)
+        return page
 
     def _extract_links(self, crawl_result: Any) -> Dict[str, Any]:
         """Extract all links from crawled page."""
@@ -222,6 +384,56 @@ class FlexibleScraper:
             "total_links": len(links),
         }
 
+    async def _complete(self, user_prompt: str, max_tokens: int) -> Tuple[str, Optional[str]]:
+        """Run a single LLM completion (OpenRouter or Gemini), using the LLM cache if set.
+
+        Returns:
+            The response text, and the cache key to store it under once the caller has
+            validated it (None if the response came from the cache or caching is off)
+        """
+        cache_key = None
+        if self.cache is not None:
+            model = self.model if self.use_openai else "gemini-2.5-flash"
+            cache_key = hashlib.sha256(
+                f"{model}\n{max_tokens}\n{user_prompt}".encode("utf-8")
+            ).hexdigest()
+            cached = await self.cache.aget(ScrapeCache.LLM, cache_key)
+            if cached is not None:
+                return cached, None
+
+        if self.use_openai:
+            # Use OpenAI-compatible client (OpenRouter, etc.)
+            response = await self.openai_client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": user_prompt}],
+                temperature=0,
+                max_tokens=max_tokens,
+            )
+            response_text = response.choices[0].message.content or ""
+        else:
+            # Legacy: Use direct Gemini API
+            from google.genai import types
+            config = types.GenerateContentConfig(
+                temperature=0,
+                max_output_tokens=max_tokens,
+            )
+            # Async client, so other crawls and heartbeats keep running during generation
+            response = await self.gemini_client.aio.models.generate_content(
+                model="gemini-2.5-flash",  # Direct Gemini model name
+                contents=user_prompt,
+                config=config,
+            )
+            if not response.text:
+                raise ValueError("Content generation blocked or no content generated")
+            response_text = response.text
+
+        return response_text.strip(), cache_key
+
+    async def _cache_llm_response(self, cache_key: Optional[str], response_text: str) -> None:
+        """Store an LLM response that parsed successfully."""
+        if cache_key is not None and self.cache is not None:
+            await self.cache.aset(ScrapeCache.LLM, cache_key, response_text)
+
     async def _extract_with_llm(
         self,
         html_content: str,
@@ -250,32 +462,8 @@ HTML Content:
 Return the extracted data as a JSON object.
 """
 
-            if self.use_openai:
-                # Use OpenAI-compatible client (OpenRouter, etc.)
-                response = await self.openai_client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": user_prompt}],
-                    temperature=0,
-                    max_tokens=8192,
-                )
-                response_text = response.choices[0].message.content or ""
-            else:
-                # Legacy: Use direct Gemini API
-                from google.genai import types
-                config = types.GenerateContentConfig(
-                    temperature=0,
-                    max_output_tokens=8192,
-                )
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.5-flash",  # Direct Gemini model name
-                    contents=user_prompt,
-                    config=config,
-                )
-                if not response.text:
-                    raise ValueError("Content generation blocked or no content generated")
-                response_text = response.text
-
-            response_text = response_text.strip()
+            raw_response, cache_key = await self._complete(user_prompt, max_tokens=8192)
+            response_text = raw_response
 
             # Clean markdown code blocks
             if response_text.startswith("```"):
@@ -289,6 +477,8 @@ Return the extracted data as a JSON object.
             except json.JSONDecodeError as e:
                 raise FlexibleScraperError(f"LLM returned invalid JSON: {str(e)}")
 
+            await self._cache_llm_response(cache_key, raw_response)
+
             if not isinstance(extracted_data, dict):
                 extracted_data = {"result": extracted_data}
 
@@ -321,32 +511,8 @@ Return ONLY a JSON array of the full URLs to visit, like:
 ["https://example.com/page1", "https://example.com/page2"]
 """
 
-            if self.use_openai:
-                # Use OpenAI-compatible client (OpenRouter, etc.)
-                response = await self.openai_client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": discovery_prompt}],
-                    temperature=0,
-                    max_tokens=2048,
-                )
-                response_text = response.choices[0].message.content or ""
-            else:
-                # Legacy: Use direct Gemini API
-                from google.genai import types
-                config = types.GenerateContentConfig(
-                    temperature=0,
-                    max_output_tokens=2048,
-                )
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=discovery_prompt,
-                    config=config,
-                )
-                if not response.text:
-                    raise ValueError("Content generation blocked or no content generated")
-                response_text = response.text
-
-            response_text = response_text.strip()
+            raw_response, cache_key = await self._complete(discovery_prompt, max_tokens=2048)
+            response_text = raw_response
 
             if response_text.startswith("```"):
                 lines = response_text.split("\n")[1:]
@@ -363,6 +529,9 @@ Return ONLY a JSON array of the full URLs to visit, like:
                 if isinstance(url, str) and urlparse(url).netloc == base_domain:
                     valid_urls.append(url)
 
+            if isinstance(urls, list):
+                await self._cache_llm_response(cache_key, raw_response)
+
             return valid_urls[:max_links]
 
         except Exception:
@@ -386,3 +555,12 @@ Return ONLY a JSON array of the full URLs to visit, like:
                 merged[key] = val1 if val1 is not None else val2
 
         return merged
+
+
+def _is_main_navigation(request: Any) -> bool:
+    """True if a Playwright request is the top-level document navigation."""
+    try:
+        return request.is_navigation_request() and request.frame.parent_frame is None
+    except Exception:
+        # Service worker requests have no frame
+        return False
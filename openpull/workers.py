@@ -0,0 +1,536 @@
+"""Multi-process worker mode for running many scrapes on one machine.
+
+A WorkerPool lives in the front process (e.g. the API server) and dispatches scrape
+jobs to N worker processes. Each worker owns a small pool of browsers and its own
+event loop; workers share the page and LLM cache through a ScrapeCache file.
+
+The pool supervises its workers: a worker is restarted when its process dies, when
+it stops sending heartbeats, when all of its browsers are held by jobs past
+job_timeout, or (after finishing its in-flight jobs) when the proportional memory
+(PSS) of its process tree, Chromium included, exceeds max_memory_mb. Jobs that time out are cancelled
+in the worker and count as busy until the worker confirms the cancellation.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache import ScrapeCache
+from .scraper import FlexibleScraper, FlexibleScraperError
+
+logger = logging.getLogger(__name__)
+
+ScraperFactory = Callable[[Optional[ScrapeCache]], FlexibleScraper]
+
+
+class WorkerConfig:
+    """Settings for WorkerPool. Every value can be overridden from the environment."""
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        browsers_per_worker: int = 2,
+        max_memory_mb: int = 0,
+        job_timeout: float = 180.0,
+        heartbeat_interval: float = 5.0,
+        heartbeat_timeout: float = 90.0,
+        health_check_interval: float = 5.0,
+        cache_path: Optional[str] = None,
+        cache_ttl: int = 3600,
+    ):
+        """Initialize WorkerConfig.
+
+        Args:
+            num_workers: Number of worker processes (0 means worker mode is off)
+            browsers_per_worker: Browsers each worker keeps open (its job concurrency)
+            max_memory_mb: Restart a worker whose process tree exceeds this PSS (0 disables)
+            job_timeout: Seconds before a submitted job fails with a timeout
+            heartbeat_interval: Seconds between worker heartbeats
+            heartbeat_timeout: Restart a worker that has not sent a heartbeat for this long
+            health_check_interval: Seconds between supervisor health checks
+            cache_path: SQLite file for the shared page/LLM cache (None disables caching)
+            cache_ttl: Seconds a cache entry stays valid
+        """
+        if num_workers < 0:
+            raise FlexibleScraperError("num_workers must not be negative")
+        if browsers_per_worker < 1:
+            raise FlexibleScraperError("browsers_per_worker must be at least 1")
+
+        self.num_workers = num_workers
+        self.browsers_per_worker = browsers_per_worker
+        self.max_memory_mb = max_memory_mb
+        self.job_timeout = job_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.health_check_interval = health_check_interval
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+
+    @classmethod
+    def from_env(cls, environ: Optional[Dict[str, str]] = None) -> "WorkerConfig":
+        """Build a config from OPENPULL_* environment variables.
+
+        Recognized variables: OPENPULL_WORKERS, OPENPULL_BROWSERS_PER_WORKER,
+        OPENPULL_WORKER_MAX_MEMORY_MB, OPENPULL_JOB_TIMEOUT, OPENPULL_HEARTBEAT_INTERVAL,
+        OPENPULL_HEARTBEAT_TIMEOUT, OPENPULL_HEALTH_CHECK_INTERVAL, OPENPULL_CACHE_PATH,
+        OPENPULL_CACHE_TTL. OPENPULL_WORKERS unset or 0 gives num_workers=0 (worker mode off).
+        """
+        env = os.environ if environ is None else environ
+        defaults = cls()
+
+        def read(name: str, default: Any, cast: Callable[[str], Any]) -> Any:
+            value = env.get(name)
+            if value is None or value == "":
+                return default
+            try:
+                return cast(value)
+            except ValueError:
+                raise FlexibleScraperError(f"Invalid value for {name}: {value!r}")
+
+        return cls(
+            num_workers=read("OPENPULL_WORKERS", 0, int),
+            browsers_per_worker=read(
+                "OPENPULL_BROWSERS_PER_WORKER", defaults.browsers_per_worker, int
+            ),
+            max_memory_mb=read("OPENPULL_WORKER_MAX_MEMORY_MB", defaults.max_memory_mb, int),
+            job_timeout=read("OPENPULL_JOB_TIMEOUT", defaults.job_timeout, float),
+            heartbeat_interval=read(
+                "OPENPULL_HEARTBEAT_INTERVAL", defaults.heartbeat_interval, float
+            ),
+            heartbeat_timeout=read("OPENPULL_HEARTBEAT_TIMEOUT", defaults.heartbeat_timeout, float),
+            health_check_interval=read(
+                "OPENPULL_HEALTH_CHECK_INTERVAL", defaults.health_check_interval, float
+            ),
+            cache_path=read("OPENPULL_CACHE_PATH", defaults.cache_path, str),
+            cache_ttl=read("OPENPULL_CACHE_TTL", defaults.cache_ttl, int),
+        )
+
+    def create_cache(self) -> Optional[ScrapeCache]:
+        """Create the shared cache described by this config, if any."""
+        if not self.cache_path:
+            return None
+        return ScrapeCache(self.cache_path, ttl=self.cache_ttl)
+
+
+class _WorkerHandle:
+    """Front-process state for one worker slot."""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.job_queue: Any = None
+        self.result_queue: Any = None
+        self.reader: Optional[threading.Thread] = None
+        self.pending: Dict[int, "asyncio.Future[Any]"] = {}
+        # Jobs that timed out in the front process but have not been confirmed
+        # cancelled by the worker; they still hold a browser or a queue slot.
+        self.cancelling: Dict[int, float] = {}
+        self.job_started: Dict[int, float] = {}
+        self.last_heartbeat = 0.0
+        self.jobs_completed = 0
+        self.restarts = 0
+        self.draining = False
+        self.drain_started = 0.0
+        self.memory_mb = 0.0
+        self.last_restart_reason: Optional[str] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def busy(self) -> int:
+        """Jobs the worker is still working on, including ones being cancelled."""
+        return len(self.pending) + len(self.cancelling)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "draining": self.draining,
+            "in_flight": self.busy,
+            "cancelling": len(self.cancelling),
+            "jobs_completed": self.jobs_completed,
+            "restarts": self.restarts,
+            "memory_mb": round(self.memory_mb, 1),
+            "seconds_since_heartbeat": (
+                round(time.monotonic() - self.last_heartbeat, 1) if self.last_heartbeat else None
+            ),
+            "last_restart_reason": self.last_restart_reason,
+        }
+
+
+class WorkerPool:
+    """Dispatches scrape jobs from the current process to supervised worker processes.
+
+    Example:
+        pool = WorkerPool(build_scraper, WorkerConfig(num_workers=4))
+        await pool.start()
+        result = await pool.submit(url="https://example.com", prompt="Extract the title")
+        await pool.stop()
+
+    scraper_factory is called inside each worker with the shared cache (or None) and
+    must return a FlexibleScraper. It has to be picklable, i.e. a module-level function.
+    """
+
+    def __init__(self, scraper_factory: ScraperFactory, config: Optional[WorkerConfig] = None):
+        self.scraper_factory = scraper_factory
+        self.config = config or WorkerConfig()
+        if self.config.num_workers < 1:
+            raise FlexibleScraperError("WorkerPool needs num_workers of at least 1")
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers = [_WorkerHandle(i) for i in range(self.config.num_workers)]
+        self._job_ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._supervisor: Optional["asyncio.Task[None]"] = None
+        self._running = False
+
+    async def start(self) -> None:
+        """Start all worker processes and the supervisor."""
+        if self._running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._running = True
+        for handle in self._workers:
+            self._spawn(handle)
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the supervisor, ask workers to exit, and kill any that do not."""
+        self._running = False
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+        for handle in self._workers:
+            if handle.alive:
+                handle.job_queue.put(None)
+        deadline = time.monotonic() + timeout
+        for handle in self._workers:
+            if handle.process is not None:
+                await asyncio.to_thread(
+                    handle.process.join, max(0.0, deadline - time.monotonic())
+                )
+            await self._terminate(handle, "Worker pool stopped")
+
+    async def submit(self, **scrape_kwargs: Any) -> Dict[str, Any]:
+        """Run FlexibleScraper.scrape(**scrape_kwargs) on the least busy healthy worker.
+
+        If every worker is draining or restarting, waits up to job_timeout for one
+        to come back before giving up.
+
+        Raises:
+            FlexibleScraperError: If scraping fails, the worker crashes, or the job times out
+        """
+        if not self._running or self._loop is None:
+            raise FlexibleScraperError("Worker pool is not running")
+
+        handle = await self._wait_for_worker()
+
+        job_id = next(self._job_ids)
+        future: "asyncio.Future[Any]" = self._loop.create_future()
+        handle.pending[job_id] = future
+        handle.job_started[job_id] = time.monotonic()
+        handle.job_queue.put(("run", job_id, scrape_kwargs))
+
+        try:
+            return await asyncio.wait_for(future, timeout=self.config.job_timeout)
+        except asyncio.TimeoutError:
+            if handle.pending.pop(job_id, None) is not None:
+                # Keep the job counted as busy until the worker confirms it stopped
+                handle.cancelling[job_id] = time.monotonic()
+                handle.job_queue.put(("cancel", job_id))
+            raise FlexibleScraperError(
+                f"Scrape timed out after {self.config.job_timeout:.0f}s in worker {handle.worker_id}"
+            )
+        finally:
+            handle.pending.pop(job_id, None)
+
+    async def _wait_for_worker(self) -> _WorkerHandle:
+        """Return the least busy worker accepting jobs, waiting up to job_timeout for one."""
+        deadline = time.monotonic() + self.config.job_timeout
+        while True:
+            available = [h for h in self._workers if h.alive and not h.draining]
+            if available:
+                return min(available, key=lambda h: h.busy)
+            if not self._running or time.monotonic() >= deadline:
+                raise FlexibleScraperError("No healthy workers available")
+            await asyncio.sleep(min(0.1, self.config.health_check_interval))
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Per-worker health summary."""
+        return [handle.to_dict() for handle in self._workers]
+
+    @property
+    def healthy(self) -> bool:
+        """True if at least one worker can accept jobs."""
+        return self._running and any(h.alive and not h.draining for h in self._workers)
+
+    def _spawn(self, handle: _WorkerHandle) -> None:
+        """Start a fresh process (with fresh queues) for a worker slot."""
+        handle.job_queue = self._ctx.Queue()
+        handle.result_queue = self._ctx.Queue()
+        handle.process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                handle.worker_id,
+                self.scraper_factory,
+                self.config,
+                handle.job_queue,
+                handle.result_queue,
+            ),
+            name=f"openpull-worker-{handle.worker_id}",
+            daemon=True,
+        )
+        handle.process.start()
+        handle.last_heartbeat = time.monotonic()
+        handle.draining = False
+        handle.memory_mb = 0.0
+        handle.reader = threading.Thread(
+            target=self._read_results,
+            args=(handle, handle.process, handle.result_queue),
+            name=f"openpull-worker-{handle.worker_id}-reader",
+            daemon=True,
+        )
+        handle.reader.start()
+
+    def _read_results(
+        self,
+        handle: _WorkerHandle,
+        process: multiprocessing.process.BaseProcess,
+        result_queue: Any,
+    ) -> None:
+        """Forward messages from one worker process to the event loop until it exits."""
+        while True:
+            try:
+                message = result_queue.get(timeout=0.5)
+            except queue.Empty:
+                if handle.process is not process or not process.is_alive():
+                    return
+                continue
+            except (EOFError, OSError, ValueError):
+                return
+            assert self._loop is not None
+            self._loop.call_soon_threadsafe(self._handle_message, handle, message)
+
+    def _handle_message(self, handle: _WorkerHandle, message: Any) -> None:
+        """Apply a worker message (heartbeat or job result) on the event loop."""
+        kind = message[0]
+        if kind == "heartbeat":
+            handle.last_heartbeat = time.monotonic()
+            return
+
+        _, job_id, ok, payload = message
+        handle.jobs_completed += 1
+        handle.job_started.pop(job_id, None)
+        handle.cancelling.pop(job_id, None)
+        future = handle.pending.pop(job_id, None)
+        if future is None or future.done():
+            return
+        if ok:
+            future.set_result(payload)
+        else:
+            future.set_exception(FlexibleScraperError(payload))
+
+    async def _supervise(self) -> None:
+        """Periodically check worker liveness, heartbeats and memory; restart as needed."""
+        while self._running:
+            await asyncio.sleep(self.config.health_check_interval)
+            now = time.monotonic()
+            for handle in self._workers:
+                if not self._running:
+                    return
+                if not handle.alive:
+                    reason = "memory limit exceeded" if handle.draining else "crashed"
+                    await self._restart(handle, reason)
+                    continue
+
+                if now - handle.last_heartbeat > self.config.heartbeat_timeout:
+                    await self._restart(handle, "heartbeat timeout")
+                    continue
+
+                # Jobs past job_timeout (plus one check of grace for the cancel to land)
+                # still hold a browser; once every browser is held, the worker is stuck.
+                stuck_after = self.config.job_timeout + self.config.health_check_interval
+                stuck = sum(1 for started in handle.job_started.values() if now - started > stuck_after)
+                if stuck >= self.config.browsers_per_worker:
+                    await self._restart(handle, "all browsers busy past job_timeout")
+                    continue
+
+                if handle.draining:
+                    if now - handle.drain_started > self.config.job_timeout:
+                        await self._restart(handle, "drain timeout")
+                    continue
+
+                handle.memory_mb = await asyncio.to_thread(
+                    _process_tree_pss_mb, handle.process.pid
+                )
+                if self.config.max_memory_mb and handle.memory_mb > self.config.max_memory_mb:
+                    # Stop routing jobs here; the worker exits after its in-flight jobs
+                    # and is restarted on a later check.
+                    handle.draining = True
+                    handle.drain_started = now
+                    handle.job_queue.put(None)
+
+    async def _restart(self, handle: _WorkerHandle, reason: str) -> None:
+        """Replace a worker process, failing jobs it can no longer answer."""
+        logger.warning("openpull worker %d restarting (%s)", handle.worker_id, reason)
+        await self._terminate(handle, f"Worker {handle.worker_id} restarted ({reason})")
+        handle.restarts += 1
+        handle.last_restart_reason = reason
+        self._spawn(handle)
+
+    async def _terminate(self, handle: _WorkerHandle, error: str) -> None:
+        """Kill a worker process if still running and fail its pending jobs."""
+        process = handle.process
+        if process is not None and process.is_alive():
+            process.kill()
+            await asyncio.to_thread(process.join, 5)
+        for future in handle.pending.values():
+            if not future.done():
+                future.set_exception(FlexibleScraperError(error))
+        handle.pending.clear()
+        handle.cancelling.clear()
+        handle.job_started.clear()
+        for q in (handle.job_queue, handle.result_queue):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+
+
+def _worker_main(
+    worker_id: int,
+    scraper_factory: ScraperFactory,
+    config: WorkerConfig,
+    job_queue: Any,
+    result_queue: Any,
+) -> None:
+    """Entry point of a worker process."""
+    asyncio.run(_worker_loop(worker_id, scraper_factory, config, job_queue, result_queue))
+
+
+async def _worker_loop(
+    worker_id: int,
+    scraper_factory: ScraperFactory,
+    config: WorkerConfig,
+    job_queue: Any,
+    result_queue: Any,
+) -> None:
+    """Run jobs from job_queue on this worker's browser pool until a None sentinel arrives.
+
+    Messages are ("run", job_id, scrape_kwargs), ("cancel", job_id) or None.
+    """
+
+    async def heartbeat() -> None:
+        while True:
+            result_queue.put(("heartbeat", worker_id))
+            await asyncio.sleep(config.heartbeat_interval)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    cache = config.create_cache()
+    browsers: "asyncio.Queue[FlexibleScraper]" = asyncio.Queue()
+
+    async def run_job(job_id: int, scrape_kwargs: Dict[str, Any]) -> None:
+        scraper = None
+        try:
+            scraper = await browsers.get()
+            result = await scraper.scrape(**scrape_kwargs)
+            result_queue.put(("result", job_id, True, result))
+        except asyncio.CancelledError:
+            result_queue.put(("result", job_id, False, "Scrape cancelled"))
+        except Exception as e:
+            result_queue.put(("result", job_id, False, str(e)))
+        finally:
+            if scraper is not None:
+                browsers.put_nowait(scraper)
+            jobs.pop(job_id, None)
+
+    jobs: Dict[int, "asyncio.Task[None]"] = {}
+    try:
+        for _ in range(config.browsers_per_worker):
+            scraper = scraper_factory(cache)
+            await scraper.open()
+            browsers.put_nowait(scraper)
+
+        while True:
+            message = await asyncio.to_thread(job_queue.get)
+            if message is None:
+                break
+            if message[0] == "cancel":
+                task = jobs.get(message[1])
+                if task is not None:
+                    task.cancel()
+                continue
+            _, job_id, scrape_kwargs = message
+            jobs[job_id] = asyncio.create_task(run_job(job_id, scrape_kwargs))
+        if jobs:
+            await asyncio.gather(*jobs.values(), return_exceptions=True)
+    finally:
+        heartbeat_task.cancel()
+        while not browsers.empty():
+            await browsers.get_nowait().close()
+        if cache is not None:
+            cache.close()
+
+
+def _process_tree_pss_mb(pid: int) -> float:
+    """Proportional memory in MB of a process and all of its descendants (Linux /proc).
+
+    Uses PSS from /proc/<pid>/smaps_rollup so pages shared between Chromium processes
+    are counted once in total rather than once per process. Falls back to RSS (which
+    overcounts shared pages) where smaps_rollup is unavailable, and returns 0.0 without
+    /proc, which disables memory-based restarts.
+    """
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0.0
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so parse after its closing parenthesis
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total_kb += _process_pss_kb(current)
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+def _process_pss_kb(pid: int) -> int:
+    """PSS of one process in kB, or its RSS if smaps_rollup cannot be read."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, IndexError, ValueError):
+        return 0
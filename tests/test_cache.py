@@ -0,0 +1,106 @@
+"""Tests for ScrapeCache."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from openpull import FlexibleScraper, FlexibleScraperError, RenderProfile, ScrapeCache
+
+
+def test_set_and_get(tmp_path):
+    """Test that values round-trip through the cache."""
+    cache = ScrapeCache(str(tmp_path / "cache.db"))
+    cache.set(ScrapeCache.PAGES, "https://example.com", {"html": "<h1>Hi</h1>"})
+    assert cache.get(ScrapeCache.PAGES, "https://example.com") == {"html": "<h1>Hi</h1>"}
+    assert cache.get(ScrapeCache.LLM, "https://example.com") is None
+
+
+def test_entries_shared_between_instances(tmp_path):
+    """Test that two instances on the same file see each other's writes."""
+    path = str(tmp_path / "cache.db")
+    ScrapeCache(path).set(ScrapeCache.LLM, "key", "response")
+    assert ScrapeCache(path).get(ScrapeCache.LLM, "key") == "response"
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    """Test that entries past their TTL are not returned."""
+    cache = ScrapeCache(str(tmp_path / "cache.db"), ttl=1)
+    cache.set(ScrapeCache.LLM, "key", "response")
+    cache._connection().execute("UPDATE cache SET expires_at = ?", (time.time() - 1,))
+    assert cache.get(ScrapeCache.LLM, "key") is None
+    assert cache.purge_expired() == 0
+
+
+def test_expired_entries_are_purged_on_write(tmp_path):
+    """Test that expired entries are removed periodically even if never read again."""
+    cache = ScrapeCache(str(tmp_path / "cache.db"), ttl=1)
+    cache.PURGE_EVERY = 2
+    cache.set(ScrapeCache.PAGES, "old", "html")
+    cache._connection().execute("UPDATE cache SET expires_at = ?", (time.time() - 1,))
+    cache.set(ScrapeCache.PAGES, "new", "html")
+
+    keys = [row[0] for row in cache._connection().execute("SELECT key FROM cache")]
+    assert keys == ["new"]
+
+
+class CountingCrawler:
+    def __init__(self):
+        self.calls = 0
+        self.crawler_strategy = SimpleNamespace(set_hook=lambda name, hook: None)
+
+    async def arun(self, url, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(success=True, error_message=None, url=url, html="<a>", markdown="a")
+
+
+@pytest.mark.asyncio
+async def test_page_cache_key_includes_profile_and_options(tmp_path):
+    """Test that pages are cached per render profile and crawl options, and hits are reported."""
+    cache = ScrapeCache(str(tmp_path / "cache.db"))
+    crawler = CountingCrawler()
+    scraper = FlexibleScraper(openai_client=object(), cache=cache, render_profile=RenderProfile())
+
+    stats = scraper.render_profile.create_stats()
+    await scraper._crawl(crawler, "https://example.com", 30, stats, js_code=["scroll()"])
+    await scraper._crawl(crawler, "https://example.com", 30, stats)
+    assert crawler.calls == 2
+    assert stats.to_dict()["from_cache"] is False
+
+    await scraper._crawl(crawler, "https://example.com", 30, stats, js_code=["scroll()"])
+    assert crawler.calls == 2
+    assert stats.to_dict()["pages_from_cache"] == 1
+    assert stats.to_dict()["from_cache"] is True
+
+    scraper.render_profile = RenderProfile.lightweight()
+    await scraper._crawl(crawler, "https://example.com", 30, stats)
+    assert crawler.calls == 3
+
+
+class ScriptedOpenAIClient:
+    """Returns the given responses in order and counts calls."""
+
+    def __init__(self, responses):
+        self.calls = 0
+
+        async def create(**kwargs):
+            content = responses[min(self.calls, len(responses) - 1)]
+            self.calls += 1
+            message = SimpleNamespace(content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+@pytest.mark.asyncio
+async def test_invalid_llm_responses_are_not_cached(tmp_path):
+    """Test that only LLM responses that parse as JSON are cached."""
+    client = ScriptedOpenAIClient(["not json", '{"title": "Hi"}'])
+    scraper = FlexibleScraper(openai_client=client, cache=ScrapeCache(str(tmp_path / "cache.db")))
+
+    with pytest.raises(FlexibleScraperError, match="invalid JSON"):
+        await scraper._extract_with_llm("<h1>Hi</h1>", "Extract the title")
+    assert await scraper._extract_with_llm("<h1>Hi</h1>", "Extract the title") == {"title": "Hi"}
+    assert client.calls == 2
+
+    assert await scraper._extract_with_llm("<h1>Hi</h1>", "Extract the title") == {"title": "Hi"}
+    assert client.calls == 2
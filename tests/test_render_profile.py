@@ -0,0 +1,227 @@
+"""Tests for RenderProfile."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from openpull import FlexibleScraper, RenderProfile
+
+
+def test_default_profile_blocks_images_fonts_and_media():
+    """Test that the default profile blocks heavy resource types and uses a small viewport."""
+    profile = RenderProfile()
+    assert profile.block_reason("https://example.com/a.png", "image") == "resource_type"
+    assert profile.block_reason("https://example.com/a.woff2", "font") == "resource_type"
+    assert profile.block_reason("https://example.com/a.mp4", "media") == "resource_type"
+    assert profile.block_reason("https://example.com/app.css", "stylesheet") is None
+    assert (profile.viewport_width, profile.viewport_height) == (960, 540)
+
+
+def test_image_and_css_flags_control_those_types():
+    """Test that images and stylesheets are only controlled by their flags."""
+    profile = RenderProfile(disable_images=False)
+    assert profile.block_reason("https://example.com/a.png", "image") is None
+
+    with pytest.raises(ValueError, match="disable_images"):
+        RenderProfile(blocked_resource_types=["image", "font"])
+
+
+def test_domain_blocklist_matches_subdomains():
+    """Test that blocked domains also match their subdomains."""
+    profile = RenderProfile()
+    assert profile.block_reason("https://www.google-analytics.com/g.js", "script") == "domain"
+    assert profile.block_reason("https://stats.g.doubleclick.net/x", "xhr") == "domain"
+    assert profile.block_reason("https://notdoubleclick.net/x", "xhr") is None
+
+
+def test_only_main_document_is_exempt():
+    """Test that the top-level navigation goes through but ad iframes are blocked."""
+    profile = RenderProfile(blocked_domains=["example.com", "doubleclick.net"])
+    assert profile.block_reason("https://example.com/", "document", is_main_document=True) is None
+    assert (
+        profile.block_reason("https://ad.doubleclick.net/frame.html", "document", "example.com")
+        == "domain"
+    )
+    assert profile.block_reason("https://www.youtube.com/embed/x", "document", "example.com") is None
+
+
+def test_lightweight_profile():
+    """Test that the lightweight profile blocks CSS and third-party scripts."""
+    profile = RenderProfile.lightweight()
+    assert (profile.viewport_width, profile.viewport_height) == (800, 450)
+    assert profile.block_reason("https://example.com/app.css", "stylesheet") == "resource_type"
+    assert (
+        profile.block_reason("https://cdn.other.com/lib.js", "script", "www.example.com")
+        == "third_party_script"
+    )
+    assert profile.block_reason("https://static.example.com/app.js", "script", "www.example.com") is None
+
+
+def test_third_party_scripts_on_country_code_domains():
+    """Test that sites under co.uk-style suffixes are not treated as first-party."""
+    profile = RenderProfile.lightweight()
+    assert (
+        profile.block_reason("https://cdn.tracker.co.uk/t.js", "script", "www.example.co.uk")
+        == "third_party_script"
+    )
+    assert profile.block_reason("https://static.example.co.uk/app.js", "script", "www.example.co.uk") is None
+
+
+def test_render_stats_summary():
+    """Test that stats count blocked requests and loaded bytes."""
+    profile = RenderProfile()
+    stats = profile.create_stats()
+    stats.record_blocked("image", "resource_type")
+    stats.record_blocked("script", "domain")
+    stats.record_allowed()
+    stats.record_response({"content-length": "1234"})
+    stats.record_response({})
+
+    summary = stats.to_dict()
+    assert summary["requests_blocked"] == 2
+    assert summary["requests_allowed"] == 1
+    assert summary["bytes_loaded"] == 1234
+    assert summary["estimated_bytes_saved"] == (
+        RenderProfile.ESTIMATED_BYTES_BY_TYPE["image"] + RenderProfile.ESTIMATED_BYTES_BY_TYPE["script"]
+    )
+    assert summary["blocked_by_type"] == {"image": 1, "script": 1}
+    assert summary["blocked_by_reason"] == {"resource_type": 1, "domain": 1}
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, main_frame=False):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = SimpleNamespace(parent_frame=None if main_frame else object())
+
+    def is_navigation_request(self):
+        return self.resource_type == "document"
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class FakePage:
+    def __init__(self):
+        self.viewport = None
+        self.listeners = {}
+        self.route_handler = None
+
+    async def set_viewport_size(self, size):
+        self.viewport = size
+
+    def on(self, event, callback):
+        self.listeners[event] = callback
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+
+# Hook types accepted by crawl4ai 0.4.24
+KNOWN_HOOKS = {
+    "on_browser_created",
+    "on_page_context_created",
+    "on_user_agent_updated",
+    "on_execution_started",
+    "before_goto",
+    "after_goto",
+    "before_return_html",
+    "before_retrieve_html",
+}
+
+
+class FakeCrawler:
+    """Runs the registered page hook and routes a fixed set of requests through it."""
+
+    def __init__(self, requests):
+        self.requests = requests
+        self.routes = []
+        self.hooks = {}
+        self.crawler_strategy = SimpleNamespace(set_hook=self.set_hook)
+
+    def set_hook(self, hook_type, hook):
+        # Same check as crawl4ai's AsyncPlaywrightCrawlerStrategy.set_hook
+        if hook_type not in KNOWN_HOOKS:
+            raise ValueError(f"Invalid hook type: {hook_type}")
+        self.hooks[hook_type] = hook
+
+    async def arun(self, url, **kwargs):
+        page = FakePage()
+        await self.hooks["on_page_context_created"](page, context=None)
+        # Let other scrapes on this crawler open their pages before routing ours
+        await asyncio.sleep(0)
+        for request in self.requests:
+            route = FakeRoute(request)
+            await page.route_handler(route)
+            self.routes.append(route)
+            if route.outcome == "continue":
+                page.listeners["response"](SimpleNamespace(headers={"content-length": "100"}))
+        self.page = page
+        return SimpleNamespace(
+            success=True, error_message=None, url=url, html="<h1>Hi</h1>", markdown="# Hi"
+        )
+
+
+class FakeOpenAIClient:
+    def __init__(self):
+        async def create(**kwargs):
+            message = SimpleNamespace(content='{"heading": "Hi"}')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+@pytest.mark.asyncio
+async def test_render_hook_blocks_requests_and_reports_stats():
+    """Test that the page hook aborts blocked requests and the result carries stats."""
+    crawler = FakeCrawler(
+        [
+            FakeRequest("https://example.com/", "document", main_frame=True),
+            FakeRequest("https://example.com/logo.png", "image"),
+            FakeRequest("https://ad.doubleclick.net/frame.html", "document"),
+            FakeRequest("https://example.com/app.js", "script"),
+        ]
+    )
+    scraper = FlexibleScraper(openai_client=FakeOpenAIClient(), render_profile=RenderProfile())
+    scraper._install_render_hook(crawler)
+    scraper._crawler = crawler
+
+    result = await scraper.scrape(url="https://example.com/", prompt="Extract the heading")
+
+    assert [route.outcome for route in crawler.routes] == ["continue", "abort", "abort", "continue"]
+    assert crawler.page.viewport == {"width": 960, "height": 540}
+    assert result["heading"] == "Hi"
+    assert result["_render_stats"]["requests_blocked"] == 2
+    assert result["_render_stats"]["requests_allowed"] == 2
+    assert result["_render_stats"]["bytes_loaded"] == 200
+    assert result["_render_stats"]["blocked_by_reason"] == {"resource_type": 1, "domain": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scrapes_on_one_crawler_keep_separate_stats():
+    """Test that each scrape on a shared crawler gets its own stats and page domain."""
+    crawler = FakeCrawler([FakeRequest("https://cdn.alpha.com/app.js", "script")])
+    scraper = FlexibleScraper(
+        openai_client=FakeOpenAIClient(), render_profile=RenderProfile.lightweight()
+    )
+    scraper._install_render_hook(crawler)
+    scraper._crawler = crawler
+
+    alpha, beta = await asyncio.gather(
+        scraper.scrape(url="https://www.alpha.com/", prompt="Extract the heading"),
+        scraper.scrape(url="https://www.beta.com/", prompt="Extract the heading"),
+    )
+
+    assert alpha["_render_stats"]["requests_allowed"] == 1
+    assert alpha["_render_stats"]["requests_blocked"] == 0
+    assert beta["_render_stats"]["requests_allowed"] == 0
+    assert beta["_render_stats"]["blocked_by_reason"] == {"third_party_script": 1}
@@ -0,0 +1,195 @@
+"""Tests for WorkerPool."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from openpull import FlexibleScraperError, WorkerConfig, WorkerPool
+
+
+class FakeScraper:
+    """Stands in for FlexibleScraper inside worker processes."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def scrape(self, url, prompt=None, **kwargs):
+        if url == "crash":
+            os._exit(1)
+        if url == "freeze":
+            # Blocks the worker's event loop, so heartbeats stop
+            time.sleep(3600)
+        if url == "hang":
+            await asyncio.sleep(3600)
+        if url == "stuck":
+            while True:
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    pass
+        if url == "fail":
+            raise FlexibleScraperError("Domain not found. Please check the URL is correct.")
+        if self.cache is not None:
+            self.cache.set("pages", url, prompt)
+        return {"url": url, "pid": os.getpid()}
+
+
+def build_fake_scraper(cache):
+    return FakeScraper(cache)
+
+
+def test_config_from_env():
+    """Test that OPENPULL_* variables override defaults."""
+    config = WorkerConfig.from_env(
+        {"OPENPULL_WORKERS": "4", "OPENPULL_WORKER_MAX_MEMORY_MB": "1500", "OPENPULL_CACHE_PATH": ""}
+    )
+    assert config.num_workers == 4
+    assert config.max_memory_mb == 1500
+    assert config.browsers_per_worker == WorkerConfig().browsers_per_worker
+    assert config.create_cache() is None
+
+
+def test_zero_workers_means_worker_mode_off():
+    """Test that OPENPULL_WORKERS unset or 0 disables worker mode instead of failing."""
+    assert WorkerConfig.from_env({}).num_workers == 0
+    assert WorkerConfig.from_env({"OPENPULL_WORKERS": "0"}).num_workers == 0
+    with pytest.raises(FlexibleScraperError, match="num_workers"):
+        WorkerPool(build_fake_scraper, WorkerConfig(num_workers=0))
+
+
+def test_config_rejects_invalid_values():
+    """Test that bad configuration raises FlexibleScraperError."""
+    with pytest.raises(FlexibleScraperError, match="OPENPULL_WORKERS"):
+        WorkerConfig.from_env({"OPENPULL_WORKERS": "many"})
+    with pytest.raises(FlexibleScraperError, match="num_workers"):
+        WorkerConfig(num_workers=-1)
+
+
+@pytest.mark.asyncio
+async def test_pool_dispatches_and_shares_cache(tmp_path):
+    """Test that jobs run in worker processes and write to the shared cache."""
+    config = WorkerConfig(num_workers=2, cache_path=str(tmp_path / "cache.db"))
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        results = [
+            await pool.submit(url=f"https://example.com/{i}", prompt=str(i)) for i in range(4)
+        ]
+        assert {r["url"] for r in results} == {f"https://example.com/{i}" for i in range(4)}
+        assert all(r["pid"] != os.getpid() for r in results)
+
+        with pytest.raises(FlexibleScraperError, match="Domain not found"):
+            await pool.submit(url="fail")
+
+        cache = config.create_cache()
+        assert cache.get("pages", "https://example.com/3") == "3"
+        assert all(worker["alive"] for worker in pool.health())
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_crashed_worker():
+    """Test that a crashed worker fails its job and is replaced."""
+    config = WorkerConfig(num_workers=1, health_check_interval=0.1)
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        with pytest.raises(FlexibleScraperError, match="crashed"):
+            await pool.submit(url="crash")
+
+        result = await pool.submit(url="https://example.com")
+        assert result["url"] == "https://example.com"
+        assert pool.health()[0]["restarts"] == 1
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_is_cancelled_in_worker():
+    """Test that a timed-out job stays counted as busy until the worker cancels it."""
+    config = WorkerConfig(num_workers=1, browsers_per_worker=1, job_timeout=0.5)
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        with pytest.raises(FlexibleScraperError, match="timed out"):
+            await pool.submit(url="hang")
+        for _ in range(50):
+            if pool.health()[0]["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.1)
+        assert pool.health()[0]["in_flight"] == 0
+
+        # The browser was released, so the next job runs without waiting
+        result = await pool.submit(url="https://example.com")
+        assert result["url"] == "https://example.com"
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_worker_with_all_browsers_stuck():
+    """Test that a worker whose browsers ignore cancellation is restarted."""
+    config = WorkerConfig(
+        num_workers=1, browsers_per_worker=1, job_timeout=0.5, health_check_interval=0.1
+    )
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        with pytest.raises(FlexibleScraperError, match="timed out"):
+            await pool.submit(url="stuck")
+        for _ in range(50):
+            if pool.health()[0]["restarts"]:
+                break
+            await asyncio.sleep(0.1)
+        assert pool.health()[0]["last_restart_reason"] == "all browsers busy past job_timeout"
+
+        result = await pool.submit(url="https://example.com")
+        assert result["url"] == "https://example.com"
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_worker_without_heartbeats():
+    """Test that a worker whose event loop stops sending heartbeats is replaced."""
+    config = WorkerConfig(
+        num_workers=1, heartbeat_interval=0.1, heartbeat_timeout=1.0, health_check_interval=0.1
+    )
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        with pytest.raises(FlexibleScraperError, match="heartbeat timeout"):
+            await pool.submit(url="freeze")
+
+        result = await pool.submit(url="https://example.com")
+        assert result["url"] == "https://example.com"
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_worker_over_memory_limit():
+    """Test that a worker over max_memory_mb is drained and replaced, and jobs still run."""
+    config = WorkerConfig(num_workers=1, max_memory_mb=1, health_check_interval=0.2)
+    pool = WorkerPool(build_fake_scraper, config)
+    await pool.start()
+    try:
+        for _ in range(50):
+            if pool.health()[0]["restarts"]:
+                break
+            await asyncio.sleep(0.1)
+        assert pool.health()[0]["last_restart_reason"] == "memory limit exceeded"
+
+        # Submitting while the only worker drains waits for its replacement
+        result = await pool.submit(url="https://example.com")
+        assert result["url"] == "https://example.com"
+    finally:
+        await pool.stop()